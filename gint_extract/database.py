@@ -1,14 +1,78 @@
+import contextlib
+import csv
+import datetime
+import decimal
+import hashlib
+import io
+import json
 import os
+import sqlite3
+import threading
+import uuid
 import warnings
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 import pyodbc
-from sqlalchemy import create_engine
 
 from gint_extract.vars import SYSTEM_TABLES
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 warnings.filterwarnings("ignore", category=UserWarning, module="pandas")
 
+# Directory holding the table metadata cached between runs, one JSON file per database.
+METADATA_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "gint_extract")
+
+# Version of the cached table metadata. Bump it whenever the way tables are listed or
+# probed changes, so entries written by older versions are not reused.
+METADATA_CACHE_VERSION = 1
+
+# SQLite column type, and converter for values sqlite3 cannot bind directly, keyed
+# by the Python type pyodbc reports for a column. Unknown types are stored as TEXT.
+_SQLITE_TYPES = {
+    bool: ("INTEGER", None),
+    int: ("INTEGER", None),
+    float: ("REAL", None),
+    decimal.Decimal: ("REAL", float),
+    str: ("TEXT", None),
+    datetime.datetime: ("TIMESTAMP", str),
+    datetime.date: ("DATE", str),
+    datetime.time: ("TIME", str),
+    uuid.UUID: ("TEXT", str),
+    bytes: ("BLOB", None),
+    bytearray: ("BLOB", None),
+}
+
+# pandas dtype keyed by the Python type pyodbc reports for a column, used for the
+# chunks written to CSV. Setting it from the cursor, rather than letting pandas infer
+# it, keeps every chunk of a table alike (e.g. an integer column stays integer in
+# chunks that contain NULLs). Other types are left for pandas to infer.
+_PANDAS_DTYPES = {
+    bool: "boolean",
+    int: "Int64",
+    float: "float64",
+    decimal.Decimal: "float64",
+    datetime.datetime: "datetime64[us]",
+}
+
+# Format of datetimes in CSV files. Access stores datetimes to the second.
+CSV_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Size of the in-process buffer used when writing CSV files.
+CSV_BUFFER_SIZE = 4 * 1024 * 1024
+
 
 def check_dir(dir_path):
     """
@@ -23,6 +87,284 @@ def check_dir(dir_path):
         os.makedirs(dir_path)
 
 
+def _to_frame(rows, description, cast=False):
+    """
+    Builds a DataFrame from rows fetched with a pyodbc cursor.
+
+    Parameters
+    ----------
+    rows : list of pyodbc.Row
+        The fetched rows.
+    description : tuple
+        The `description` attribute of the cursor the rows were fetched from.
+    cast : bool, optional
+        If True, set column dtypes from the types reported by the cursor (see
+        `_PANDAS_DTYPES`) instead of inferring them, so DataFrames built from
+        different chunks of the same table have the same dtypes. Defaults to False.
+
+    Returns
+    -------
+    pd.DataFrame
+        The rows as a DataFrame, with column names taken from the cursor.
+    """
+    columns = [column[0] for column in description]
+    df = pd.DataFrame.from_records(
+        [tuple(row) for row in rows], columns=columns, coerce_float=True
+    )
+    if not cast:
+        return df
+    dtypes = {
+        name: _PANDAS_DTYPES[type_code]
+        for name, type_code, *_ in description
+        if type_code in _PANDAS_DTYPES
+    }
+    return df.astype(dtypes)
+
+
+def _open_csv(directory, table, compression=None):
+    """
+    Opens the CSV file for a table for writing in binary mode.
+
+    Parameters
+    ----------
+    directory : str
+        The path to the directory where the CSV file will be saved.
+    table : str
+        The name of the table.
+    compression : {None, "zstd"}, optional
+        If "zstd", the file is compressed with Zstandard and saved as `<table>.csv.zst`.
+
+    Returns
+    -------
+    file object
+        The open file.
+    """
+    check_dir(directory)
+    if compression is None:
+        path = os.path.join(directory, f"{table}.csv")
+        return open(path, "wb", buffering=CSV_BUFFER_SIZE)
+    path = os.path.join(directory, f"{table}.csv.zst")
+    return zstandard.ZstdCompressor().stream_writer(
+        open(path, "wb", buffering=CSV_BUFFER_SIZE)
+    )
+
+
+def _to_record_batch(rows, description):
+    """
+    Builds a PyArrow RecordBatch from rows fetched with a pyodbc cursor.
+
+    Each column is converted straight to a typed Arrow array, chosen from the Python
+    type pyodbc reports for it, without going through pandas.
+
+    Parameters
+    ----------
+    rows : list of pyodbc.Row
+        The fetched rows.
+    description : tuple
+        The `description` attribute of the cursor the rows were fetched from.
+
+    Returns
+    -------
+    pa.RecordBatch
+        The rows as a RecordBatch, with column names taken from the cursor.
+    """
+    arrow_types = {
+        bool: (pa.bool_(), None),
+        int: (pa.int64(), None),
+        float: (pa.float64(), None),
+        decimal.Decimal: (pa.float64(), float),
+        str: (pa.string(), None),
+        datetime.datetime: (pa.timestamp("us"), None),
+        datetime.date: (pa.date32(), None),
+        datetime.time: (pa.time64("us"), None),
+        uuid.UUID: (pa.string(), str),
+        bytes: (pa.binary(), None),
+        bytearray: (pa.binary(), bytes),
+    }
+    names = [column[0] for column in description]
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    arrays = []
+    for values, (_, type_code, *_) in zip(columns, description):
+        type_, convert = arrow_types.get(type_code, (pa.string(), str))
+        if convert is not None:
+            values = [None if value is None else convert(value) for value in values]
+        arrays.append(pa.array(values, type=type_))
+    return pa.RecordBatch.from_arrays(arrays, names=names)
+
+
+def check_csv_options(compression=None, engine="pandas"):
+    """
+    Checks that CSV output options are supported and their dependencies are installed.
+
+    Parameters
+    ----------
+    compression : {None, "zstd"}, optional
+        The compression to check. Defaults to None.
+    engine : {"pandas", "pyarrow"}, optional
+        The CSV engine to check. Defaults to "pandas".
+
+    Raises
+    ------
+    ValueError
+        If the compression or engine is not supported.
+    ImportError
+        If a package required by the compression or engine is not installed.
+    """
+    if compression not in (None, "zstd"):
+        raise ValueError(f"Unsupported compression: {compression}")
+    if compression == "zstd" and zstandard is None:
+        raise ImportError("zstandard is required to write zstd-compressed CSV files")
+    if engine not in ("pandas", "pyarrow"):
+        raise ValueError(f"Unsupported CSV engine: {engine}")
+    if engine == "pyarrow" and pa is None:
+        raise ImportError(
+            "pyarrow is required to write CSV files with engine='pyarrow'"
+        )
+
+
+def _write_csv_chunk(f, chunk, header):
+    """
+    Writes a chunk of a table to an open CSV file.
+
+    DataFrames are written with pandas' CSV writer and RecordBatches with PyArrow's.
+    The two format some values differently (e.g. `True` and `1.0` with pandas,
+    `true` and `1` with PyArrow).
+
+    Parameters
+    ----------
+    f : file object
+        The CSV file, opened in binary mode.
+    chunk : pd.DataFrame or pa.RecordBatch
+        The rows to write.
+    header : bool
+        Whether to write the column names before the rows.
+    """
+    if isinstance(chunk, pd.DataFrame):
+        f.write(
+            chunk.to_csv(
+                header=header, index=False, date_format=CSV_DATE_FORMAT
+            ).encode()
+        )
+        return
+    if header:
+        # PyArrow always quotes header names, so only quote them where needed
+        line = io.StringIO()
+        csv.writer(line, lineterminator=os.linesep).writerow(chunk.schema.names)
+        f.write(line.getvalue().encode())
+    pacsv.write_csv(
+        chunk,
+        f,
+        write_options=pacsv.WriteOptions(
+            include_header=False, quoting_style="needed", eol=os.linesep
+        ),
+    )
+
+
+def _create_sqlite_table(sqlite_conn, table, description):
+    """
+    Creates (or replaces) an SQLite table matching the columns of a pyodbc cursor.
+
+    Parameters
+    ----------
+    sqlite_conn : sqlite3.Connection
+        The SQLite connection to create the table in.
+    table : str
+        The name of the table.
+    description : tuple
+        The `description` attribute of the cursor the rows will be fetched from.
+
+    Returns
+    -------
+    tuple of (str, list)
+        The INSERT statement for the table, and the (column index, converter) pairs
+        for columns whose values must be converted before inserting.
+    """
+    columns = [
+        (name, *_SQLITE_TYPES.get(type_code, ("TEXT", str)))
+        for name, type_code, *_ in description
+    ]
+    sqlite_conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+    sqlite_conn.execute(
+        f"CREATE TABLE {_quote(table)} ("
+        + ", ".join(f"{_quote(name)} {type_}" for name, type_, _ in columns)
+        + ")"
+    )
+    insert = f"INSERT INTO {_quote(table)} VALUES ({', '.join('?' * len(columns))})"
+    converters = [
+        (i, convert) for i, (_, _, convert) in enumerate(columns) if convert is not None
+    ]
+    return insert, converters
+
+
+def _insert_sqlite_rows(sqlite_conn, insert, converters, rows):
+    """
+    Inserts a batch of rows fetched with a pyodbc cursor into an SQLite table.
+
+    Parameters
+    ----------
+    sqlite_conn : sqlite3.Connection
+        The SQLite connection to insert the rows with.
+    insert : str
+        The INSERT statement returned by `_create_sqlite_table`.
+    converters : list of tuple
+        The converters returned by `_create_sqlite_table`.
+    rows : list of pyodbc.Row
+        The rows to insert.
+    """
+    if converters:
+        rows = [list(row) for row in rows]
+        for row in rows:
+            for i, convert in converters:
+                if row[i] is not None:
+                    row[i] = convert(row[i])
+    sqlite_conn.executemany(insert, rows)
+
+
+def _quote(identifier):
+    """
+    Quotes an identifier for use in an SQLite statement.
+
+    Parameters
+    ----------
+    identifier : str
+        The table or column name to quote.
+
+    Returns
+    -------
+    str
+        The identifier wrapped in double quotes.
+    """
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class _LazyTables(Mapping):
+    """
+    A read-only mapping of table names to DataFrames that reads each table on access.
+
+    Parameters
+    ----------
+    db : GintDatabase
+        The database to read the tables from.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def __getitem__(self, table):
+        if table not in self.db.non_empty_tables:
+            raise KeyError(table)
+        return self.db.get_table(table)
+
+    def __contains__(self, table):
+        return table in self.db.non_empty_tables
+
+    def __iter__(self):
+        return iter(self.db.non_empty_tables)
+
+    def __len__(self):
+        return len(self.db.non_empty_tables)
+
+
 class GintDatabase:
     """
     A class for interacting with a gINT database (Access format) and exporting its tables.
@@ -31,6 +373,12 @@ class GintDatabase:
     ----------
     file_path : str
         The path to the gINT database file (.mdb or .accdb).
+    cache : bool, optional
+        If True, tables retrieved with `get_table` are kept in memory and reused on
+        subsequent calls. Defaults to False.
+    metadata_cache : bool, optional
+        If True, the table names and non-empty tables are saved to `METADATA_CACHE_DIR`
+        and reused by later runs until the database file changes. Defaults to True.
 
     Attributes
     ----------
@@ -47,23 +395,38 @@ class GintDatabase:
 
     Methods
     -------
+    close()
+        Closes the cursor and the connection to the database.
     get_table(table)
         Retrieves the content of a table as a pandas DataFrame.
+    arrow_table(table)
+        Retrieves the content of a table as a PyArrow Table, without using pandas.
+    clear_cache()
+        Discards any tables held in memory by `get_table`.
     table_length(table)
         Returns the number of rows in a given table.
-    write_table_to_csv(table, directory)
+    write_table_to_csv(table, directory, compression=None, engine="pandas")
         Writes the content of a table to a CSV file.
     dfs()
-        Returns a dictionary of non-empty tables as pandas DataFrames.
-    write_all_tables_to_csv(directory)
+        Returns a mapping of non-empty tables to pandas DataFrames, loaded on access.
+    write_all_tables_to_csv(directory, max_workers=None, compression=None,
+                            engine="pandas")
         Writes all non-empty tables in the database to CSV files in the specified directory.
-    write_table_to_sqlite(table, sqlite_conn)
+    write_table_to_parquet(table, directory)
+        Writes the content of a table to a Parquet file.
+    write_all_tables_to_parquet(directory, max_workers=None)
+        Writes all non-empty tables in the database to Parquet files in the specified
+        directory.
+    write_table_to_sqlite(table, sqlite_conn, chunksize=50_000)
         Writes the content of a table to an SQLite database.
+    write_table_to(table, *, csv_dir=None, sqlite_conn=None, chunksize=50_000,
+                   compression=None, engine="pandas")
+        Writes the content of a table to CSV and/or SQLite, reading it only once.
     write_all_tables_to_sqlite(destination_path)
         Writes all non-empty tables to an SQLite database at the specified path.
     """
 
-    def __init__(self, file_path):
+    def __init__(self, file_path, cache=False, metadata_cache=True):
         """
         Initialize the GintDatabase object and connect to the database.
 
@@ -71,29 +434,143 @@ class GintDatabase:
         ----------
         file_path : str
             Path to the gINT database file (.mdb or .accdb).
+        cache : bool, optional
+            If True, keep tables retrieved with `get_table` in memory. Defaults to False.
+        metadata_cache : bool, optional
+            If True, reuse table metadata saved by a previous run on the same,
+            unchanged file. Defaults to True.
         """
         self.connStr = (
             r"DRIVER={Microsoft Access Driver (*.mdb, *.accdb)};" r"DBQ=%s;" % file_path
         )
         self.file_path = file_path
+        self.cache = cache
+        self._table_cache = {}
+        self._select_sql = {}
+        self.metadata_cache = metadata_cache
         self.cnxn = pyodbc.connect(self.connStr)
         self.cursor = self.cnxn.cursor()
+        self._local = threading.local()
+        self._local.cnxn = self.cnxn
+        self._thread_cnxns = []
         try:
-            self.table_names = [
-                row.table_name
-                for row in self.cursor.tables()
-                if row.table_name not in SYSTEM_TABLES
-            ]
-            self.non_empty_tables = [
-                table for table in self.table_names if self.table_length(table) > 0
-            ]
+            metadata = self._read_metadata_cache()
+            if metadata is not None:
+                self.table_names = metadata["table_names"]
+                self.non_empty_tables = metadata["non_empty_tables"]
+            else:
+                self.table_names = [
+                    row.table_name
+                    for row in self.cursor.tables(tableType="TABLE")
+                    if row.table_name not in SYSTEM_TABLES
+                ]
+                self.non_empty_tables = self._find_non_empty_tables(self.table_names)
+                self._write_metadata_cache()
         except Exception as e:
             print(f"Failed to load database with {e}")
 
+    def close(self):
+        """
+        Closes the cursor and the connection to the database.
+
+        The database can also be used as a context manager, which closes it on exit.
+        Calling `close` again has no effect.
+        """
+        try:
+            self._close_thread_connections()
+        finally:
+            # Closing the connection also closes its cursors
+            if not self.cnxn.closed:
+                try:
+                    self.cursor.close()
+                finally:
+                    self.cnxn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _metadata_cache_key(self):
+        """
+        Locates the metadata cache file for the database and fingerprints the database.
+
+        Returns
+        -------
+        tuple of (str, dict) or None
+            The path of the cache file and a fingerprint of the database file and of
+            the code that lists its tables, or None if the metadata cache is disabled
+            or the database file cannot be found.
+        """
+        if not self.metadata_cache:
+            return None
+        path = os.path.abspath(self.file_path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        name = hashlib.sha256(path.encode()).hexdigest()
+        fingerprint = {
+            "version": METADATA_CACHE_VERSION,
+            "system_tables": hashlib.sha256(
+                "\n".join(SYSTEM_TABLES).encode()
+            ).hexdigest(),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+        return os.path.join(METADATA_CACHE_DIR, f"{name}.json"), fingerprint
+
+    def _read_metadata_cache(self):
+        """
+        Reads the table metadata saved by a previous run, if it is still valid.
+
+        Returns
+        -------
+        dict or None
+            The cached metadata, or None if there is no cache entry, or the database
+            file or the way tables are listed has changed since it was written.
+        """
+        key = self._metadata_cache_key()
+        if key is None:
+            return None
+        cache_path, fingerprint = key
+        try:
+            with open(cache_path) as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if metadata.get("fingerprint") != fingerprint:
+            return None
+        return metadata
+
+    def _write_metadata_cache(self):
+        """
+        Saves the table metadata so later runs can skip probing the database.
+        """
+        key = self._metadata_cache_key()
+        if key is None:
+            return
+        cache_path, fingerprint = key
+        metadata = {
+            "fingerprint": fingerprint,
+            "table_names": self.table_names,
+            "non_empty_tables": self.non_empty_tables,
+        }
+        try:
+            check_dir(METADATA_CACHE_DIR)
+            with open(cache_path, "w") as f:
+                json.dump(metadata, f)
+        except OSError:
+            pass
+
     def get_table(self, table):
         """
         Retrieves the content of a table as a pandas DataFrame.
 
+        If the database was opened with `cache=True`, the DataFrame is stored and
+        returned directly on later calls instead of querying the database again.
+
         Parameters
         ----------
         table : str
@@ -104,12 +581,113 @@ class GintDatabase:
         pd.DataFrame
             The content of the table as a DataFrame.
         """
-        sql = f"SELECT * FROM [{table}]"
-        with warnings.catch_warnings():
-            warnings.filterwarnings(
-                "ignore", message="pandas only supports SQLAlchemy connectable"
-            )
-            return pd.read_sql(sql, self.cnxn)
+        if table in self._table_cache:
+            return self._table_cache[table]
+        cursor = self._select(table)
+        try:
+            df = _to_frame(cursor.fetchall(), cursor.description)
+        finally:
+            cursor.close()
+        if self.cache:
+            self._table_cache[table] = df
+        return df
+
+    def _iter_row_batches(self, table, chunksize=50_000):
+        """
+        Yields the rows of a table in batches, straight from a pyodbc cursor.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table to retrieve.
+        chunksize : int, optional
+            The maximum number of rows in each batch. Defaults to 50,000.
+
+        Yields
+        ------
+        tuple of (list of pyodbc.Row, tuple)
+            Consecutive batches of rows, with the `description` of the cursor they
+            were fetched from. An empty table yields a single empty batch, so callers
+            still get its columns.
+        """
+        cursor = self._select(table)
+        # `fetchmany()` fetches `arraysize` rows per call
+        cursor.arraysize = chunksize
+        try:
+            rows = cursor.fetchmany()
+            yield rows, cursor.description
+            while rows:
+                rows = cursor.fetchmany()
+                if rows:
+                    yield rows, cursor.description
+        finally:
+            cursor.close()
+
+    def _iter_record_batches(self, table, chunksize=50_000):
+        """
+        Yields the content of a table as a series of PyArrow RecordBatches.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table to retrieve.
+        chunksize : int, optional
+            The maximum number of rows in each RecordBatch. Defaults to 50,000.
+
+        Yields
+        ------
+        pa.RecordBatch
+            Consecutive chunks of the table.
+        """
+        for rows, description in self._iter_row_batches(table, chunksize):
+            yield _to_record_batch(rows, description)
+
+    def arrow_table(self, table):
+        """
+        Retrieves the content of a table as a PyArrow Table, without using pandas.
+
+        Requires PyArrow to be installed.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table to retrieve.
+
+        Returns
+        -------
+        pa.Table
+            The content of the table as a PyArrow Table.
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required to read tables as Arrow tables")
+        return pa.Table.from_batches(list(self._iter_record_batches(table)))
+
+    def _select(self, table):
+        """
+        Opens a new cursor on the current thread's connection and selects a whole table.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table to select.
+
+        Returns
+        -------
+        pyodbc.Cursor
+            A cursor positioned before the first row of the table.
+        """
+        sql = self._select_sql.get(table)
+        if sql is None:
+            sql = self._select_sql[table] = f"SELECT * FROM [{table}]"
+        cursor = self._connection().cursor()
+        cursor.execute(sql)
+        return cursor
+
+    def clear_cache(self):
+        """
+        Discards any tables held in memory by `get_table`.
+        """
+        self._table_cache.clear()
 
     def table_length(self, table):
         """
@@ -125,80 +703,348 @@ class GintDatabase:
         int
             The number of rows in the table.
         """
-        sql = f"SELECT * FROM [{table}]"
-        with warnings.catch_warnings():
-            warnings.filterwarnings(
-                "ignore", message="pandas only supports SQLAlchemy connectable"
+        sql = f"SELECT COUNT(*) FROM [{table}]"
+        return self.cursor.execute(sql).fetchval()
+
+    def _connection(self):
+        """
+        Returns the database connection for the current thread.
+
+        The Access ODBC driver is not safe to share between threads, so each thread
+        gets its own connection, opened on first use (or again if it was closed).
+        Connections opened here stay open until `close` is called.
+
+        Returns
+        -------
+        pyodbc.Connection
+            The connection to use from the calling thread.
+        """
+        cnxn = getattr(self._local, "cnxn", None)
+        if cnxn is None or cnxn.closed:
+            cnxn = pyodbc.connect(self.connStr)
+            self._local.cnxn = cnxn
+            self._thread_cnxns.append(cnxn)
+        return cnxn
+
+    def _close_thread_connections(self):
+        """
+        Closes any connections opened by `_connection` for other threads.
+
+        Connections that were already closed (and replaced) are skipped.
+        """
+        while self._thread_cnxns:
+            cnxn = self._thread_cnxns.pop()
+            if not cnxn.closed:
+                cnxn.close()
+
+    def _find_non_empty_tables(self, tables, batch_size=32):
+        """
+        Finds which tables contain at least one row, probing several tables per query.
+
+        Each query is a UNION ALL of `SELECT TOP 1` probes that returns the names of
+        the non-empty tables in the batch. If a batch query fails, its tables are
+        probed one at a time instead.
+
+        Parameters
+        ----------
+        tables : list of str
+            The names of the tables to check.
+        batch_size : int, optional
+            The number of tables probed per query. Defaults to 32, the most tables
+            Access allows in a single query.
+
+        Returns
+        -------
+        list of str
+            The non-empty tables, in the order they were given.
+        """
+        non_empty = set()
+        for start in range(0, len(tables), batch_size):
+            batch = tables[start : start + batch_size]
+            sql = " UNION ALL ".join(
+                "SELECT TOP 1 '{}' FROM [{}]".format(table.replace("'", "''"), table)
+                for table in batch
             )
-            return len(pd.read_sql(sql, self.cnxn))
+            try:
+                non_empty.update(row[0] for row in self.cursor.execute(sql).fetchall())
+            except pyodbc.Error:
+                non_empty.update(table for table in batch if self._has_rows(table))
+        return [table for table in tables if table in non_empty]
 
-    def write_table_to_csv(self, table, directory):
+    def _has_rows(self, table):
+        """
+        Checks whether a table contains at least one row without counting them all.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table to check.
+
+        Returns
+        -------
+        bool
+            True if the table has at least one row.
+        """
+        sql = f"SELECT TOP 1 1 FROM [{table}]"
+        return self.cursor.execute(sql).fetchone() is not None
+
+    def write_table_to_csv(self, table, directory, compression=None, engine="pandas"):
         """
         Writes the content of a table to a CSV file in the specified directory.
 
+        The table is read and written in chunks so it is never fully held in memory.
+
         Parameters
         ----------
         table : str
             The name of the table to export.
         directory : str
             The path to the directory where the CSV file will be saved.
+        compression : {None, "zstd"}, optional
+            If "zstd", compress the file with Zstandard (requires the `zstandard`
+            package) and save it as `<table>.csv.zst`. Defaults to None.
+        engine : {"pandas", "pyarrow"}, optional
+            The CSV writer to use. "pyarrow" converts rows straight to Arrow and is
+            faster, but formats booleans, floats and datetimes differently from
+            "pandas". Defaults to "pandas".
         """
-        check_dir(directory)
-        self.get_table(table).to_csv(
-            os.path.join(directory, f"{table}.csv"), index=False
+        self.write_table_to(
+            table, csv_dir=directory, compression=compression, engine=engine
         )
 
     def dfs(self):
         """
-        Returns a dictionary of non-empty tables as pandas DataFrames.
+        Returns a mapping of non-empty tables to pandas DataFrames.
+
+        Each table is only read from the database when it is accessed, so iterating
+        over the tables holds one of them in memory at a time. Use `dict(db.dfs())`
+        to load them all at once.
 
         Returns
         -------
-        dict of pd.DataFrame
-            A dictionary where the keys are table names and values are DataFrames.
+        Mapping of str to pd.DataFrame
+            A mapping where the keys are table names and values are DataFrames.
         """
-        dataframes = {}
-        for table in self.non_empty_tables:
-            dataframes[table] = self.get_table(table)
-        return dataframes
+        return _LazyTables(self)
 
-    def write_all_tables_to_csv(self, directory):
+    def write_all_tables_to_csv(
+        self, directory, max_workers=None, compression=None, engine="pandas"
+    ):
         """
         Writes all non-empty tables in the database to CSV files in the specified directory.
 
+        Tables are exported concurrently from a pool of threads, each with its own
+        connection to the database.
+
         Parameters
         ----------
         directory : str
             The path to the directory where the CSV files will be saved.
+        max_workers : int, optional
+            The number of tables to export at once. Defaults to the number of
+            non-empty tables, up to 8.
+        compression : {None, "zstd"}, optional
+            If "zstd", compress each file with Zstandard. Defaults to None.
+        engine : {"pandas", "pyarrow"}, optional
+            The CSV writer to use, see `write_table_to_csv`. Defaults to "pandas".
+        """
+        check_csv_options(compression, engine)
+        check_dir(directory)
+        self._for_each_table(
+            lambda table: self.write_table_to_csv(
+                table, directory, compression, engine
+            ),
+            max_workers,
+        )
+
+    def write_table_to_parquet(self, table, directory):
+        """
+        Writes the content of a table to a zstd-compressed Parquet file.
+
+        The table is read and written in chunks, one row group per chunk, so it is
+        never fully held in memory. Requires PyArrow to be installed.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table to export.
+        directory : str
+            The path to the directory where the Parquet file will be saved.
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required to write Parquet files")
+        check_dir(directory)
+        chunks = self._iter_record_batches(table)
+        path = os.path.join(directory, f"{table}.parquet")
+        writer = None
+        try:
+            for chunk in chunks:
+                if writer is None:
+                    writer = pq.ParquetWriter(path, chunk.schema, compression="zstd")
+                writer.write_batch(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def write_all_tables_to_parquet(self, directory, max_workers=None):
+        """
+        Writes all non-empty tables in the database to Parquet files in the specified
+        directory.
+
+        Tables are exported concurrently from a pool of threads, each with its own
+        connection to the database.
+
+        Parameters
+        ----------
+        directory : str
+            The path to the directory where the Parquet files will be saved.
+        max_workers : int, optional
+            The number of tables to export at once. Defaults to the number of
+            non-empty tables, up to 8.
         """
         check_dir(directory)
-        for table in self.non_empty_tables:
-            self.write_table_to_csv(table, directory)
+        self._for_each_table(
+            lambda table: self.write_table_to_parquet(table, directory), max_workers
+        )
+
+    def _for_each_table(self, write, max_workers=None):
+        """
+        Calls a function on every non-empty table from a pool of threads.
+
+        Parameters
+        ----------
+        write : callable
+            The function to call with each table name.
+        max_workers : int, optional
+            The number of tables to process at once. Defaults to the number of
+            non-empty tables, up to 8.
+        """
+        if max_workers is None:
+            max_workers = min(8, len(self.non_empty_tables))
+        # Each pool thread opens its own connection, which is closed with the pool
+        pool_cnxns = []
+
+        def connect():
+            cnxn = pyodbc.connect(self.connStr)
+            pool_cnxns.append(cnxn)
+            self._local.cnxn = cnxn
 
-    def write_table_to_sqlite(self, table, sqlite_conn):
+        try:
+            with ThreadPoolExecutor(
+                max_workers=max(1, max_workers), initializer=connect
+            ) as executor:
+                list(executor.map(write, self.non_empty_tables))
+        finally:
+            for cnxn in pool_cnxns:
+                cnxn.close()
+
+    def write_table_to_sqlite(self, table, sqlite_conn, chunksize=50_000):
         """
         Writes the content of a table to an SQLite database.
 
+        Rows are copied straight from the Access cursor to SQLite in batches, without
+        building DataFrames. Column types are mapped from the types pyodbc reports for
+        the table. Any existing table with the same name is replaced. The changes are
+        not committed.
+
         Parameters
         ----------
         table : str
             The name of the table to export.
-        sqlite_conn : sqlalchemy.engine.base.Connection
+        sqlite_conn : sqlite3.Connection
             The SQLite connection object.
+        chunksize : int, optional
+            The number of rows inserted per batch. Defaults to 50,000.
+        """
+        self.write_table_to(table, sqlite_conn=sqlite_conn, chunksize=chunksize)
+
+    def write_table_to(
+        self,
+        table,
+        *,
+        csv_dir=None,
+        sqlite_conn=None,
+        chunksize=50_000,
+        compression=None,
+        engine="pandas",
+    ):
         """
-        df = self.get_table(table)
-        df.to_sql(table, sqlite_conn, if_exists="replace", index=False)
+        Writes the content of a table to every requested output in a single read.
+
+        Each batch of rows fetched from the database is written to all outputs before
+        the next batch is fetched, so exporting to several formats costs one read.
+
+        Parameters
+        ----------
+        table : str
+            The name of the table to export.
+        csv_dir : str, optional
+            The path to the directory where a CSV file of the table will be saved.
+        sqlite_conn : sqlite3.Connection, optional
+            The SQLite connection to write the table to. Any existing table with the
+            same name is replaced. The changes are not committed.
+        chunksize : int, optional
+            The number of rows fetched per batch. Defaults to 50,000.
+        compression : {None, "zstd"}, optional
+            If "zstd", compress the CSV file with Zstandard. Defaults to None.
+        engine : {"pandas", "pyarrow"}, optional
+            The CSV writer to use, see `write_table_to_csv`. Defaults to "pandas".
+        """
+        check_csv_options(compression, engine)
+        with contextlib.ExitStack() as stack:
+            batches = stack.enter_context(
+                contextlib.closing(self._iter_row_batches(table, chunksize))
+            )
+            csv_file = None
+            if csv_dir is not None:
+                csv_file = stack.enter_context(_open_csv(csv_dir, table, compression))
+            for i, (rows, description) in enumerate(batches):
+                first = i == 0
+                # An empty table still gets a CSV file with its header
+                if csv_file is not None:
+                    if engine == "pyarrow":
+                        chunk = _to_record_batch(rows, description)
+                    else:
+                        chunk = _to_frame(rows, description, cast=True)
+                    _write_csv_chunk(csv_file, chunk, header=first)
+                if sqlite_conn is not None:
+                    if first:
+                        insert, converters = _create_sqlite_table(
+                            sqlite_conn, table, description
+                        )
+                    if rows:
+                        _insert_sqlite_rows(sqlite_conn, insert, converters, rows)
 
     def write_all_tables_to_sqlite(self, destination_path):
         """
         Writes all non-empty tables to an SQLite database at the specified path.
 
+        All tables are written in a single transaction, with the rollback journal
+        kept in memory and syncing turned off for the duration of the bulk load. If
+        the export fails, the transaction is rolled back. The database uses 64 KiB pages,
+        which makes bulk writes faster and the file smaller for large tables.
+
         Parameters
         ----------
         destination_path : str
             The file path to the SQLite database where the tables will be saved.
         """
-        sqlite_engine = create_engine(f"sqlite:///{destination_path}")
-        with sqlite_engine.connect() as sqlite_conn:
-            for table in self.non_empty_tables:
-                self.write_table_to_sqlite(table, sqlite_conn)
+        sqlite_conn = sqlite3.connect(destination_path, isolation_level=None)
+        try:
+            # The page size only takes effect on an existing database after a VACUUM
+            sqlite_conn.execute("PRAGMA page_size=65536")
+            sqlite_conn.execute("VACUUM")
+            # Unlike journal_mode=OFF, an in-memory journal still supports ROLLBACK
+            sqlite_conn.execute("PRAGMA journal_mode=MEMORY")
+            sqlite_conn.execute("PRAGMA synchronous=OFF")
+            sqlite_conn.execute("PRAGMA temp_store=MEMORY")
+            sqlite_conn.execute("BEGIN")
+            try:
+                for table in self.non_empty_tables:
+                    self.write_table_to_sqlite(table, sqlite_conn)
+            except BaseException:
+                sqlite_conn.execute("ROLLBACK")
+                raise
+            sqlite_conn.execute("COMMIT")
+        finally:
+            sqlite_conn.close()
@@ -1,37 +1,65 @@
+import datetime
+import decimal
+import io
 import os
+import sqlite3
 import sys
+import threading
 from unittest.mock import MagicMock, patch
 
 import pandas as pd
+import pyodbc
 import pytest
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from gint_extract.database import GintDatabase
 
 
+def mock_cursor():
+    cursor = MagicMock()
+
+    # Mock the tables method to return some table names
+    cursor.tables.return_value = [
+        MagicMock(table_name="table1"),
+        MagicMock(table_name="table2"),
+    ]
+
+    # Mock the row count returned by `SELECT COUNT(*)`
+    cursor.execute.return_value.fetchval.return_value = 2
+
+    # Mock the row returned by the `SELECT TOP 1` emptiness probe
+    cursor.execute.return_value.fetchone.return_value = (1,)
+
+    # Mock the non-empty table names returned by the batched `UNION ALL` probe
+    cursor.execute.return_value.fetchall.return_value = [("table1",), ("table2",)]
+
+    # Mock the rows and columns returned by `SELECT *`
+    rows = [(1, 3), (2, 4)]
+    cursor.description = [("col1", int), ("col2", int)]
+    cursor.fetchall.side_effect = lambda: list(rows)
+
+    def fetchmany(size=None):
+        size = size or cursor.arraysize
+        batch = rows[:size]
+        del rows[:size]
+        return batch
+
+    cursor.fetchmany.side_effect = fetchmany
+    return cursor
+
+
 @pytest.fixture
 def mock_db():
     with patch("database.pyodbc.connect") as mock_connect:
-        # Mock the database connection and cursor
-        mock_cnxn = MagicMock()
-        mock_cursor = MagicMock()
+        # Mock the database connection; each call to `cursor()` returns a new cursor
+        mock_cnxn = MagicMock(closed=False)
         mock_connect.return_value = mock_cnxn
-        mock_cnxn.cursor.return_value = mock_cursor
-
-        # Mock the tables method to return some table names
-        mock_cursor.tables.return_value = [
-            MagicMock(table_name="table1"),
-            MagicMock(table_name="table2"),
-        ]
+        mock_cnxn.cursor.side_effect = mock_cursor
 
         # Mock the SYSTEM_TABLES to exclude system tables
         global SYSTEM_TABLES
         SYSTEM_TABLES = []
 
-        # Mock the read_sql method to return a DataFrame
-        mock_df = pd.DataFrame({"col1": [1, 2], "col2": [3, 4]})
-        pd.read_sql = MagicMock(return_value=mock_df)
-
         # Initialize the GintDatabase object
         db = GintDatabase("test_path")
         yield db
@@ -41,6 +69,42 @@ def test_initialization(mock_db):
     assert mock_db.file_path == "test_path"
     assert mock_db.table_names == ["table1", "table2"]
     assert mock_db.non_empty_tables == ["table1", "table2"]
+    mock_db.cursor.tables.assert_called_once_with(tableType="TABLE")
+
+
+def test_find_non_empty_tables(mock_db):
+    mock_db.cursor.execute.reset_mock()
+    assert mock_db._find_non_empty_tables(["table1", "table2"]) == ["table1", "table2"]
+    mock_db.cursor.execute.assert_called_once_with(
+        "SELECT TOP 1 'table1' FROM [table1] UNION ALL "
+        "SELECT TOP 1 'table2' FROM [table2]"
+    )
+
+
+def test_find_non_empty_tables_batches(mock_db):
+    tables = [f"table{i}" for i in range(40)]
+    mock_db.cursor.execute.reset_mock()
+    mock_db._find_non_empty_tables(tables)
+    assert [
+        sql.count("SELECT TOP 1") for (sql,), _ in mock_db.cursor.execute.call_args_list
+    ] == [32, 8]
+
+
+def test_find_non_empty_tables_fallback(mock_db):
+    def execute(sql):
+        if "UNION ALL" in sql:
+            raise pyodbc.Error("Query is too complex")
+        result = MagicMock()
+        result.fetchone.return_value = None if "[table2]" in sql else (1,)
+        return result
+
+    mock_db.cursor.execute.side_effect = execute
+    assert mock_db._find_non_empty_tables(["table1", "table2"]) == ["table1"]
+
+
+def test_row_batches_use_arraysize(mock_db):
+    batches = list(mock_db._iter_row_batches("table1", chunksize=1))
+    assert [rows for rows, _ in batches] == [[(1, 3)], [(2, 4)]]
 
 
 def test_table_length(mock_db):
@@ -52,14 +116,317 @@ def test_get_table(mock_db):
     assert df.equals(pd.DataFrame({"col1": [1, 2], "col2": [3, 4]}))
 
 
+def test_write_table_to_csv_zstd(mock_db, tmpdir):
+    zstandard = pytest.importorskip("zstandard")
+    directory = tmpdir.mkdir("sub")
+    mock_db.write_table_to_csv("table1", str(directory), compression="zstd")
+    with open(os.path.join(directory, "table1.csv.zst"), "rb") as f:
+        with zstandard.ZstdDecompressor().stream_reader(f) as reader:
+            df = pd.read_csv(reader)
+    assert df.equals(pd.DataFrame({"col1": [1, 2], "col2": [3, 4]}))
+
+
+def test_arrow_table(mock_db):
+    pytest.importorskip("pyarrow")
+    table = mock_db.arrow_table("table1")
+    assert table.to_pydict() == {"col1": [1, 2], "col2": [3, 4]}
+
+
+def test_write_table_to_parquet(mock_db, tmpdir):
+    pytest.importorskip("pyarrow")
+    directory = tmpdir.mkdir("sub")
+    mock_db.write_table_to_parquet("table1", str(directory))
+    df = pd.read_parquet(os.path.join(directory, "table1.parquet"))
+    assert df.equals(pd.DataFrame({"col1": [1, 2], "col2": [3, 4]}))
+
+
+def test_write_table_to_parquet_ignores_cache(mock_db, tmpdir):
+    pq = pytest.importorskip("pyarrow.parquet")
+    directory = tmpdir.mkdir("sub")
+    mock_db.write_table_to_parquet("table1", str(directory.mkdir("uncached")))
+    mock_db.cache = True
+    mock_db.get_table("table1")
+    mock_db.write_table_to_parquet("table1", str(directory.mkdir("cached")))
+    uncached, cached = (
+        pq.read_schema(os.path.join(directory, name, "table1.parquet"))
+        for name in ["uncached", "cached"]
+    )
+    assert cached.equals(uncached, check_metadata=True)
+
+
+def test_dfs(mock_db):
+    dfs = mock_db.dfs()
+    assert list(dfs) == ["table1", "table2"]
+    assert len(dfs) == 2
+    assert dfs["table2"].equals(pd.DataFrame({"col1": [1, 2], "col2": [3, 4]}))
+    with pytest.raises(KeyError):
+        dfs["missing"]
+
+
+def test_dfs_membership_does_not_read_tables(mock_db):
+    dfs = mock_db.dfs()
+    with patch.object(mock_db, "get_table") as get_table:
+        assert "table1" in dfs
+        assert "missing" not in dfs
+        assert dfs.get("missing") is None
+    get_table.assert_not_called()
+
+
 def test_write_table_to_csv(mock_db, tmpdir):
     directory = tmpdir.mkdir("sub")
     mock_db.write_table_to_csv("table1", str(directory))
     assert os.path.exists(os.path.join(directory, "table1.csv"))
+    df = pd.read_csv(os.path.join(directory, "table1.csv"))
+    assert df.equals(pd.DataFrame({"col1": [1, 2], "col2": [3, 4]}))
 
 
-def test_write_tables_to_csv(mock_db, tmpdir):
+def test_write_table_to_csv_consistent_chunks(mock_db, tmpdir):
+    cursor = MagicMock()
+    cursor.description = [("depth", int), ("date", datetime.datetime)]
+    cursor.fetchmany.side_effect = [
+        [(1, datetime.datetime(2024, 9, 3)), (None, None)],
+        [(3, datetime.datetime(2024, 9, 3, 12))],
+        [],
+    ]
     directory = tmpdir.mkdir("sub")
-    mock_db.write_tables_to_csv(str(directory))
+    with patch("gint_extract.database.pa", None), patch.object(
+        mock_db, "_select", return_value=cursor
+    ):
+        mock_db.write_table_to_csv("table1", str(directory))
+    with open(os.path.join(directory, "table1.csv")) as f:
+        assert f.read().splitlines() == [
+            "depth,date",
+            "1,2024-09-03 00:00:00",
+            ",",
+            "3,2024-09-03 12:00:00",
+        ]
+
+
+def test_csv_writers(mock_db, tmpdir):
+    rows = [
+        (1.0, True, datetime.datetime(2024, 9, 3, 12)),
+        (2.5, False, datetime.datetime(2024, 9, 3)),
+    ]
+
+    def select(table):
+        cursor = MagicMock()
+        cursor.description = [
+            ("depth", float),
+            ("wet", bool),
+            ("date", datetime.datetime),
+        ]
+        cursor.fetchmany.side_effect = [list(rows), []]
+        return cursor
+
+    def write(name, **kwargs):
+        directory = str(tmpdir.join(name))
+        mock_db.write_table_to_csv("table1", directory, **kwargs)
+        with open(os.path.join(directory, "table1.csv"), "rb") as f:
+            return f.read()
+
+    with patch.object(mock_db, "_select", side_effect=select):
+        default = write("default")
+        with patch("gint_extract.database.pa", None):
+            without_pyarrow = write("without_pyarrow")
+        pyarrow = write("pyarrow", engine="pyarrow")
+    # The default output must not depend on whether PyArrow is installed
+    assert default == without_pyarrow
+    assert default.decode().splitlines() == [
+        "depth,wet,date",
+        "1.0,True,2024-09-03 12:00:00",
+        "2.5,False,2024-09-03 00:00:00",
+    ]
+    # PyArrow formats values differently, but they read back the same
+    assert pyarrow.endswith(os.linesep.encode())
+    assert pd.read_csv(io.BytesIO(pyarrow), parse_dates=["date"]).equals(
+        pd.read_csv(io.BytesIO(default), parse_dates=["date"])
+    )
+
+
+def test_write_table_to_empty_table(mock_db, tmpdir):
+    cursor = MagicMock()
+    cursor.description = [("col1", int), ("col2", int)]
+    cursor.fetchmany.return_value = []
+    directory = str(tmpdir.mkdir("sub"))
+    conn = sqlite3.connect(":memory:")
+    with patch.object(mock_db, "_select", return_value=cursor):
+        mock_db.write_table_to("table1", csv_dir=directory, sqlite_conn=conn)
+    with open(os.path.join(directory, "table1.csv")) as f:
+        assert f.read().splitlines() == ["col1,col2"]
+    assert conn.execute("SELECT * FROM table1").fetchall() == []
+    cursor.close.assert_called_once()
+
+
+def test_write_all_tables_to_csv(mock_db, tmpdir):
+    directory = tmpdir.mkdir("sub")
+    mock_db.write_all_tables_to_csv(str(directory))
     assert os.path.exists(os.path.join(directory, "table1.csv"))
     assert os.path.exists(os.path.join(directory, "table2.csv"))
+
+
+def test_write_all_tables_to_csv_requires_zstandard(mock_db, tmpdir):
+    directory = os.path.join(tmpdir, "sub")
+    with patch("gint_extract.database.zstandard", None):
+        with pytest.raises(ImportError):
+            mock_db.write_all_tables_to_csv(directory, compression="zstd")
+    assert not os.path.exists(directory)
+
+
+def test_get_table_cache(mock_db):
+    mock_db.cache = True
+    df = mock_db.get_table("table1")
+    assert mock_db.get_table("table1") is df
+    mock_db.clear_cache()
+    assert mock_db._table_cache == {}
+
+
+def test_write_all_tables_to_csv_keeps_thread_connections(mock_db, tmpdir):
+    directory = tmpdir.mkdir("sub")
+    connections = []
+
+    def connect(conn_str):
+        cnxn = MagicMock(closed=False)
+        cnxn.cursor.side_effect = mock_cursor
+        cnxn.close.side_effect = lambda: setattr(cnxn, "closed", True)
+        connections.append(cnxn)
+        return cnxn
+
+    results = []
+
+    def run():
+        mock_db.get_table("table1")
+        thread_cnxn = mock_db._connection()
+        mock_db.write_all_tables_to_csv(str(directory))
+        results.append(thread_cnxn.closed)
+        results.append(mock_db._connection() is thread_cnxn)
+
+    with patch("gint_extract.database.pyodbc.connect", side_effect=connect):
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+    assert results == [False, True]
+    # The pool's own connections are closed once the export is done
+    assert [cnxn.closed for cnxn in connections[1:]] == [True] * (len(connections) - 1)
+
+
+def test_write_table_to_sqlite(mock_db):
+    conn = sqlite3.connect(":memory:")
+    mock_db.write_table_to_sqlite("table1", conn)
+    assert conn.execute("SELECT * FROM table1").fetchall() == [(1, 3), (2, 4)]
+
+
+def test_write_all_tables_to_sqlite(mock_db, tmpdir):
+    destination_path = os.path.join(str(tmpdir), "out.sqlite")
+    mock_db.write_all_tables_to_sqlite(destination_path)
+    conn = sqlite3.connect(destination_path)
+    assert conn.execute("PRAGMA page_size").fetchone() == (65536,)
+    for table in ["table1", "table2"]:
+        assert conn.execute(f"SELECT * FROM {table}").fetchall() == [(1, 3), (2, 4)]
+    conn.close()
+
+
+def test_write_table_to_sqlite_converts_types(mock_db):
+    cursor = MagicMock()
+    cursor.description = [("depth", decimal.Decimal), ("date", datetime.datetime)]
+    cursor.fetchmany.side_effect = [
+        [(decimal.Decimal("1.5"), datetime.datetime(2024, 9, 3)), (None, None)],
+        [],
+    ]
+    conn = sqlite3.connect(":memory:")
+    with patch.object(mock_db, "_select", return_value=cursor):
+        mock_db.write_table_to_sqlite("table1", conn)
+    assert conn.execute("SELECT * FROM table1").fetchall() == [
+        (1.5, "2024-09-03 00:00:00"),
+        (None, None),
+    ]
+
+
+def test_metadata_cache(mock_db, tmpdir):
+    file_path = tmpdir.join("test.gpj")
+    file_path.write("")
+    with patch("gint_extract.database.METADATA_CACHE_DIR", str(tmpdir.mkdir("cache"))):
+        GintDatabase(str(file_path))
+        db = GintDatabase(str(file_path))
+    db.cursor.tables.assert_not_called()
+    assert db.table_names == ["table1", "table2"]
+    assert db.non_empty_tables == ["table1", "table2"]
+
+
+def test_metadata_cache_version_mismatch(mock_db, tmpdir):
+    file_path = tmpdir.join("test.gpj")
+    file_path.write("")
+    with patch("gint_extract.database.METADATA_CACHE_DIR", str(tmpdir.mkdir("cache"))):
+        GintDatabase(str(file_path))
+        with patch("gint_extract.database.METADATA_CACHE_VERSION", 2):
+            db = GintDatabase(str(file_path))
+            db.cursor.tables.assert_called_once_with(tableType="TABLE")
+            # A change to the system tables also invalidates the cache
+            with patch("gint_extract.database.SYSTEM_TABLES", ["table2"]):
+                db = GintDatabase(str(file_path))
+            db.cursor.tables.assert_called_once_with(tableType="TABLE")
+    assert db.table_names == ["table1"]
+
+
+def test_write_table_to(mock_db, tmpdir):
+    directory = str(tmpdir.mkdir("sub"))
+    conn = sqlite3.connect(":memory:")
+    mock_db.write_table_to("table1", csv_dir=directory, sqlite_conn=conn)
+    df = pd.read_csv(os.path.join(directory, "table1.csv"))
+    assert df.equals(pd.DataFrame({"col1": [1, 2], "col2": [3, 4]}))
+    assert conn.execute("SELECT * FROM table1").fetchall() == [(1, 3), (2, 4)]
+
+
+def test_context_manager(mock_db):
+    with mock_db as db:
+        assert db is mock_db
+    mock_db.cursor.close.assert_called_once()
+    mock_db.cnxn.close.assert_called_once()
+
+
+def test_write_all_tables_to_sqlite_rolls_back(mock_db, tmpdir):
+    destination_path = os.path.join(str(tmpdir), "out.sqlite")
+    conn = sqlite3.connect(destination_path)
+    conn.execute("CREATE TABLE existing (col1 INTEGER)")
+    conn.execute("INSERT INTO existing VALUES (1)")
+    conn.commit()
+    conn.close()
+    write_table_to_sqlite = mock_db.write_table_to_sqlite
+
+    def write_first_table_then_fail(table, sqlite_conn):
+        if table != "table1":
+            raise RuntimeError("boom")
+        write_table_to_sqlite(table, sqlite_conn)
+
+    with patch.object(
+        mock_db, "write_table_to_sqlite", side_effect=write_first_table_then_fail
+    ):
+        with pytest.raises(RuntimeError):
+            mock_db.write_all_tables_to_sqlite(destination_path)
+    conn = sqlite3.connect(destination_path)
+    tables = conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    assert tables.fetchall() == [("existing",)]
+    assert conn.execute("SELECT * FROM existing").fetchall() == [(1,)]
+    conn.close()
+
+
+def test_close_twice(mock_db):
+    def connect(conn_str):
+        cnxn = MagicMock(closed=False)
+        cnxn.cursor.side_effect = mock_cursor
+        cnxn.close.side_effect = lambda: setattr(cnxn, "closed", True)
+        return cnxn
+
+    mock_db.cnxn.close.side_effect = lambda: setattr(mock_db.cnxn, "closed", True)
+    mock_db._local.cnxn = None
+    with patch("gint_extract.database.pyodbc.connect", side_effect=connect):
+        stale = mock_db._connection()
+        stale.close()
+        # A closed connection is replaced, but stays in the list of thread connections
+        current = mock_db._connection()
+    assert mock_db._thread_cnxns == [stale, current]
+    with mock_db:
+        mock_db.close()
+    mock_db.cursor.close.assert_called_once()
+    mock_db.cnxn.close.assert_called_once()
+    stale.close.assert_called_once()
+    current.close.assert_called_once()
@@ -2,7 +2,7 @@ import argparse
 import os
 import sys
 
-from gint_extract.database import GintDatabase
+from gint_extract.database import GintDatabase, check_csv_options
 
 
 def main():
@@ -10,14 +10,43 @@ def main():
     parser.add_argument("file_path", help="Path to the file")
     parser.add_argument("--dir", help="output directory", default="csv")
     parser.add_argument(
-        "--format", help="output format, either `csv` or `sqlite`", default="csv"
+        "--format",
+        help="output format, either `csv`, `sqlite`, or `parquet`",
+        default="csv",
+    )
+    parser.add_argument(
+        "--compression",
+        help="compression for csv output, either `zstd` or none",
+        choices=["zstd"],
+        default=None,
+    )
+    parser.add_argument(
+        "--engine",
+        help="writer for csv output, either `pandas` (default) or `pyarrow` (faster, "
+        "but formats booleans, floats and datetimes differently)",
+        choices=["pandas", "pyarrow"],
+        default=None,
     )
     args = parser.parse_args()
-    db = GintDatabase(args.file_path)
-    if args.format == "csv":
-        db.write_all_tables_to_csv(args.dir)
-    elif args.format == "sqlite":
-        db.write_all_tables_to_sqlite(args.dir)
+    if args.format != "csv":
+        if args.compression is not None:
+            parser.error("--compression only applies to --format csv")
+        if args.engine is not None:
+            parser.error("--engine only applies to --format csv")
+    else:
+        try:
+            check_csv_options(args.compression, args.engine or "pandas")
+        except (ValueError, ImportError) as e:
+            parser.error(str(e))
+    with GintDatabase(args.file_path) as db:
+        if args.format == "csv":
+            db.write_all_tables_to_csv(
+                args.dir, compression=args.compression, engine=args.engine or "pandas"
+            )
+        elif args.format == "sqlite":
+            db.write_all_tables_to_sqlite(args.dir)
+        elif args.format == "parquet":
+            db.write_all_tables_to_parquet(args.dir)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,63 @@
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from gint_extract import extract
+
+
+def run_main(*args):
+    with patch.object(sys, "argv", ["gint-extract", "test_path", *args]), patch(
+        "gint_extract.extract.GintDatabase"
+    ) as mock_database:
+        extract.main()
+    mock_database.assert_called_once_with("test_path")
+    return mock_database.return_value.__enter__.return_value
+
+
+def test_csv_defaults():
+    db = run_main()
+    db.write_all_tables_to_csv.assert_called_once_with(
+        "csv", compression=None, engine="pandas"
+    )
+
+
+def test_csv_engine():
+    pytest.importorskip("pyarrow")
+    db = run_main("--engine", "pyarrow")
+    db.write_all_tables_to_csv.assert_called_once_with(
+        "csv", compression=None, engine="pyarrow"
+    )
+
+
+def test_csv_compression():
+    pytest.importorskip("zstandard")
+    db = run_main("--compression", "zstd")
+    db.write_all_tables_to_csv.assert_called_once_with(
+        "csv", compression="zstd", engine="pandas"
+    )
+
+
+@pytest.mark.parametrize("option", [["--compression", "zstd"], ["--engine", "pandas"]])
+@pytest.mark.parametrize("output_format", ["sqlite", "parquet"])
+def test_csv_options_rejected_for_other_formats(output_format, option):
+    with pytest.raises(SystemExit):
+        run_main("--format", output_format, *option)
+
+
+def test_csv_compression_requires_zstandard():
+    with patch("gint_extract.database.zstandard", None):
+        with pytest.raises(SystemExit):
+            run_main("--compression", "zstd")
+
+
+def test_sqlite():
+    db = run_main("--format", "sqlite", "--dir", "out.sqlite")
+    db.write_all_tables_to_sqlite.assert_called_once_with("out.sqlite")
+
+
+def test_parquet():
+    db = run_main("--format", "parquet", "--dir", "parquet")
+    db.write_all_tables_to_parquet.assert_called_once_with("parquet")